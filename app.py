@@ -12,7 +12,6 @@ import json
 import pickle
 import os
 from sklearn.preprocessing import LabelEncoder
-from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
 import matplotlib
 matplotlib.use('Agg')  # Use non-interactive backend
 import matplotlib.pyplot as plt
@@ -37,16 +36,45 @@ config_class.init_app(app)
 # Variável global para armazenar o modelo treinado
 classificador = None
 
+# Estado de prontidão do worker (modelo carregado, validado e aquecido)
+model_ready = False
+readiness_error = 'Modelo ainda não inicializado'
+
+def warm_up_model():
+    """Validar e aquecer o modelo atual, atualizando o estado de prontidão"""
+    global model_ready, readiness_error
+    try:
+        classificador.warm_up(app.config['WARMUP_ROWS'])
+        model_ready = True
+        readiness_error = None
+    except Exception as e:
+        model_ready = False
+        readiness_error = f'Falha na validação/aquecimento: {e}'
+        print(f"Erro ao aquecer modelo: {e}")
+    return model_ready
+
+def model_is_ready():
+    """Modelo carregado, validado e aquecido; só então as rotas de predição o servem"""
+    return model_ready and classificador is not None and classificador.is_trained()
+
 def init_model():
     """Inicializar o modelo classificador"""
-    global classificador
+    global classificador, model_ready, readiness_error
+    model_ready = False
     try:
         classificador = ClassificadorEstresse()
         print("Modelo inicializado com sucesso!")
-        return True
     except Exception as e:
         print(f"Erro ao inicializar modelo: {e}")
         return False
+    
+    # Pré-carregar o artefato configurado; sem ele o worker segue ativo, mas não pronto
+    if classificador.load_model(app.config['MODEL_FILE']):
+        warm_up_model()
+    else:
+        readiness_error = 'Modelo ausente ou inválido. Treine o modelo primeiro.'
+    
+    return True
 
 @app.route('/')
 def index():
@@ -62,12 +90,19 @@ def dashboard():
         flash('Modelo não foi treinado ainda. Treine o modelo primeiro.', 'warning')
         return render_template('dashboard.html', model_trained=False)
     
+    # Usar um único snapshot para métricas e gráficos da mesma página
+    snapshot = classificador.get_snapshot()
+    
     # Obter métricas do modelo
-    metrics = classificador.get_metrics()
+    metrics = classificador.get_metrics(snapshot)
+    
+    if metrics is None:
+        flash('Modelo carregado sem avaliação persistida. Treine o modelo novamente para gerar métricas.', 'warning')
+        return render_template('dashboard.html', model_trained=False)
     
     # Gerar gráficos
-    confusion_matrix_plot = create_confusion_matrix_plot()
-    feature_importance_plot = create_feature_importance_plot()
+    confusion_matrix_plot = create_confusion_matrix_plot(snapshot)
+    feature_importance_plot = create_feature_importance_plot(snapshot)
     
     return render_template('dashboard.html', 
                          model_trained=True,
@@ -83,20 +118,26 @@ def predict():
     if request.method == 'GET':
         return render_template('predict.html')
     
-    if classificador is None or not classificador.is_trained():
-        flash('Modelo não foi treinado ainda. Treine o modelo primeiro.', 'error')
+    if not model_is_ready():
+        flash(f'Modelo não está pronto: {readiness_error}', 'error')
         return render_template('predict.html')
     
     try:
         # Obter dados do formulário
         form_data = request.form.to_dict()
+        snapshot = classificador.get_snapshot()
+        
+        # Validar e converter para formato adequado para predição
+        input_data, errors = classificador.validate_input(form_data, snapshot)
         
-        # Converter para formato adequado para predição
-        input_data = classificador.prepare_input_data(form_data)
+        if errors:
+            for field, error in errors.items():
+                flash(f'{field}: {error}', 'error')
+            return render_template('predict.html')
         
         # Fazer predição
-        prediction = classificador.predict_single(input_data)
-        probability = classificador.predict_probability(input_data)
+        prediction = classificador.predict_single(input_data, snapshot)
+        probability = classificador.predict_probability(input_data, snapshot)
         
         result = {
             'prediction': prediction,
@@ -118,8 +159,8 @@ def upload_file():
     
     global classificador
     
-    if classificador is None or not classificador.is_trained():
-        flash('Modelo não foi treinado ainda. Treine o modelo primeiro.', 'error')
+    if not model_is_ready():
+        flash(f'Modelo não está pronto: {readiness_error}', 'error')
         return render_template('upload.html')
     
     if 'file' not in request.files:
@@ -137,19 +178,32 @@ def upload_file():
             # Ler o arquivo CSV
             df = pd.read_csv(file)
             
-            # Fazer predições em lote
-            predictions = classificador.predict_batch(df)
+            # Validar e fazer predições em lote apenas nas linhas válidas
+            df.columns = df.columns.str.strip()
+            predictions, errors = classificador.predict_batch_validated(df)
+            valid = predictions.notna()
+            
+            if errors:
+                rejected = len(df) - int(valid.sum())
+                details = '; '.join(
+                    f"linha {e['row'] + 1 if e['row'] is not None else '-'}, {e['field']}: {e['error']}"
+                    for e in errors[:5]
+                )
+                flash(f'{rejected} linha(s) rejeitada(s) na validação. {details}', 'warning')
+            
+            if not valid.any():
+                return render_template('upload.html')
             
             # Preparar resultados
-            results_df = df.copy()
-            results_df['Predicted_Stress_Level'] = predictions
+            results_df = df[valid].copy()
+            results_df['Predicted_Stress_Level'] = predictions[valid].astype(int)
             
             # Converter para JSON para exibição
             results_json = results_df.head(50).to_dict('records')  # Limitar a 50 registros para exibição
             
             return render_template('upload.html', 
                                  results=results_json,
-                                 total_predictions=len(predictions))
+                                 total_predictions=len(results_df))
             
         except Exception as e:
             flash(f'Erro ao processar arquivo: {str(e)}', 'error')
@@ -168,14 +222,35 @@ def train_model():
         if classificador is None:
             classificador = ClassificadorEstresse()
         
-        classificador.train_model()
-        flash('Modelo treinado com sucesso!', 'success')
+        if classificador.train_model(app.config['MODEL_FILE']):
+            warm_up_model()
+            flash('Modelo treinado com sucesso!', 'success')
+        else:
+            flash('Erro ao treinar modelo. Verifique os logs do servidor.', 'error')
         
     except Exception as e:
         flash(f'Erro ao treinar modelo: {str(e)}', 'error')
     
     return redirect(url_for('dashboard'))
 
+@app.route('/healthz')
+def healthz():
+    """Liveness: o processo está respondendo"""
+    return jsonify({'status': 'ok'})
+
+@app.route('/readyz')
+def readyz():
+    """Readiness: modelo carregado, validado e aquecido"""
+    if not model_is_ready():
+        return jsonify({'status': 'not ready', 'reason': readiness_error}), 503
+    
+    snapshot = classificador.get_snapshot()
+    return jsonify({
+        'status': 'ready',
+        'model_version': snapshot.version,
+        'model_created_at': snapshot.created_at.isoformat()
+    })
+
 @app.route('/api/metrics')
 def api_metrics():
     """API endpoint para obter métricas do modelo"""
@@ -184,22 +259,62 @@ def api_metrics():
     if classificador is None or not classificador.is_trained():
         return jsonify({'error': 'Model not trained'}), 400
     
-    metrics = classificador.get_metrics()
+    metrics = classificador.get_metrics(classificador.get_snapshot())
+    if metrics is None:
+        return jsonify({'error': 'Metrics not available'}), 400
+    
     return jsonify(metrics)
 
+@app.route('/api/feedback', methods=['POST'])
+def api_feedback():
+    """API endpoint para registrar amostras rotuladas e atualizar as métricas"""
+    global classificador
+    
+    if classificador is None or not classificador.is_trained():
+        return jsonify({'error': 'Model not trained'}), 400
+    
+    try:
+        data = request.get_json()
+        df = pd.DataFrame(data['samples'])
+        # Escritor único: com vários workers, direcione o feedback para apenas um deles
+        count, errors = classificador.registrar_feedback(df, data['labels'], app.config['MODEL_FILE'])
+        metrics = classificador.get_metrics()
+        
+        return jsonify({
+            'registered': count,
+            'errors': errors,
+            'accuracy': metrics['accuracy'] if metrics else None
+        }), (200 if count else 422)
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 400
+
 @app.route('/api/predict', methods=['POST'])
 def api_predict():
     """API endpoint para fazer predições"""
     global classificador
     
-    if classificador is None or not classificador.is_trained():
-        return jsonify({'error': 'Model not trained'}), 400
+    if not model_is_ready():
+        return jsonify({'error': 'Model not ready', 'reason': readiness_error}), 503
     
     try:
         data = request.get_json()
-        input_data = classificador.prepare_input_data(data)
-        prediction = classificador.predict_single(input_data)
-        probability = classificador.predict_probability(input_data)
+        snapshot = classificador.get_snapshot()
+        
+        # Lista de amostras: validação vetorizada e predição apenas das válidas
+        if isinstance(data, list):
+            predictions, errors = classificador.predict_batch_validated(pd.DataFrame(data), snapshot)
+            return jsonify({
+                'predictions': [None if pd.isna(p) else int(p) for p in predictions],
+                'errors': errors
+            }), (200 if predictions.notna().any() else 422)
+        
+        input_data, errors = classificador.validate_input(data, snapshot)
+        if errors:
+            return jsonify({'error': 'Invalid input', 'fields': errors}), 422
+        
+        prediction = classificador.predict_single(input_data, snapshot)
+        probability = classificador.predict_probability(input_data, snapshot)
         
         return jsonify({
             'prediction': int(prediction),
@@ -209,7 +324,7 @@ def api_predict():
     except Exception as e:
         return jsonify({'error': str(e)}), 400
 
-def create_confusion_matrix_plot():
+def create_confusion_matrix_plot(snapshot=None):
     """Criar gráfico da matriz de confusão usando matplotlib"""
     global classificador
     
@@ -217,13 +332,17 @@ def create_confusion_matrix_plot():
         return None
     
     try:
-        cm = classificador.get_confusion_matrix()
+        snapshot = snapshot or classificador.get_snapshot()
+        cm = classificador.get_confusion_matrix(snapshot)
+        
+        if cm is None:
+            return None
         
         # Criar o gráfico com matplotlib
         plt.figure(figsize=(8, 6))
         
-        # Labels corretos (1 a 5 em vez de 0 a 4)
-        class_labels = [str(i) for i in range(1, 6)]
+        # Labels na escala das notas de estresse (target_classes)
+        class_labels = snapshot.class_labels()
         
         sns.heatmap(cm, annot=True, fmt='d', cmap='Blues', 
                    xticklabels=class_labels, yticklabels=class_labels)
@@ -244,7 +363,7 @@ def create_confusion_matrix_plot():
         print(f"Erro ao criar matriz de confusão: {e}")
         return None
 
-def create_feature_importance_plot():
+def create_feature_importance_plot(snapshot=None):
     """Criar gráfico de importância das features usando matplotlib"""
     global classificador
     
@@ -252,7 +371,7 @@ def create_feature_importance_plot():
         return None
     
     try:
-        importance_df = classificador.get_feature_importance()
+        importance_df = classificador.get_feature_importance(snapshot)
         
         # Criar o gráfico com matplotlib
         plt.figure(figsize=(10, 8))
@@ -275,9 +394,12 @@ def create_feature_importance_plot():
         print(f"Erro ao criar gráfico de importância: {e}")
         return None
 
+# Inicializar o modelo na importação, para que cada worker (inclusive sob um
+# servidor WSGI como gunicorn) carregue e aqueça o modelo antes de ficar pronto
+model_initialized = init_model()
+
 if __name__ == '__main__':
-    # Inicializar o modelo ao iniciar a aplicação
-    if init_model():
+    if model_initialized:
         print("Aplicação Flask iniciada com sucesso!")
         app.run(debug=True, host='0.0.0.0', port=5000)
     else:
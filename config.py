@@ -21,6 +21,7 @@ class Config:
     # Configurações do Modelo
     MODEL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'models')
     MODEL_FILE = os.path.join(MODEL_PATH, 'model.pkl')
+    WARMUP_ROWS = int(os.environ.get('WARMUP_ROWS', 32))  # Linhas sintéticas no aquecimento
     
     # Configurações de Session
     PERMANENT_SESSION_LIFETIME = timedelta(hours=24)
@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+"""
+Pontuação em lote paralela - Classificador de Estresse Acadêmico
+
+Divide os arquivos CSV de entrada em partes (um arquivo inteiro ou faixas de
+bytes alinhadas a fins de linha de um arquivo grande) e as distribui num pool
+de processos. Cada worker carrega o modelo uma única vez no initializer, lê
+apenas a sua faixa, grava sua partição de saída e, ao final, as partições são
+concatenadas em ordem num único CSV.
+
+Uso:
+    python scripts/pontuar_lote.py coorte1.csv coorte2.csv -o resultado.csv
+    python scripts/pontuar_lote.py grande.csv -o resultado.csv --shard-size-mb 64 --workers 8
+"""
+
+import argparse
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from multiprocessing import Pool
+
+import pandas as pd
+
+# Permitir importar os módulos da raiz do projeto ao executar a partir de scripts/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.classificador_module import ClassificadorEstresse
+from config import Config
+
+PREDICTION_COLUMN = 'Predicted_Stress_Level'
+
+# Tamanho dos blocos lidos ao procurar as fronteiras das partes
+SCAN_BLOCK_SIZE = 16 * 1024 * 1024
+
+# Exemplos de erros de validação relatados por parte
+MAX_ERROR_SAMPLES = 3
+
+# Classificador carregado uma vez por processo worker
+_worker_classificador = None
+
+
+def _init_worker(model_file):
+    """Initializer do pool: carregar o modelo uma vez por processo"""
+    global _worker_classificador
+    _worker_classificador = ClassificadorEstresse()
+    if not _worker_classificador.load_model(model_file):
+        raise RuntimeError(f"Não foi possível carregar o modelo de {model_file}")
+
+
+def _read_columns(header):
+    """Interpretar a linha de cabeçalho de um CSV"""
+    return pd.read_csv(io.BytesIO(header), nrows=0).columns.str.strip().tolist()
+
+
+def _shard_ranges(path, shard_bytes=None):
+    """Dividir o corpo de um CSV em faixas de bytes que terminam em fim de linha.
+
+    Uma fronteira só é aceita quando o número de aspas antes dela é par, para
+    não cortar campos entre aspas que contêm quebras de linha.
+    """
+    with open(path, 'rb') as f:
+        header = f.readline()
+        start = f.tell()
+        size = os.fstat(f.fileno()).st_size
+
+        offsets = [start]
+        if shard_bytes:
+            pos = start
+            quotes = 0
+            target = start + shard_bytes
+            while True:
+                block = f.read(SCAN_BLOCK_SIZE)
+                if not block:
+                    break
+
+                i = 0
+                while target < pos + len(block):
+                    newline = block.find(b'\n', max(target - pos, i))
+                    if newline == -1:
+                        break
+
+                    boundary = pos + newline + 1
+                    if (quotes + block.count(b'"', 0, newline)) % 2 == 0:
+                        offsets.append(boundary)
+                        target = boundary + shard_bytes
+                    else:
+                        # Dentro de um campo entre aspas: tentar a próxima linha
+                        target = boundary
+                    i = newline + 1
+
+                quotes += block.count(b'"')
+                pos += len(block)
+
+    offsets = [offset for offset in offsets if offset < size] or [start]
+    ranges = list(zip(offsets, offsets[1:] + [size]))
+    return header, ranges
+
+
+def build_shards(input_files, shard_bytes=None):
+    """Gerar as partes (arquivo, colunas, byte inicial, byte final) e a lista de colunas de saída"""
+    shards = []
+    output_columns = []
+
+    for path in input_files:
+        header, ranges = _shard_ranges(path, shard_bytes)
+        columns = _read_columns(header)
+
+        # Colunas de todos os arquivos, na ordem em que aparecem
+        for column in columns:
+            if column not in output_columns and column != PREDICTION_COLUMN:
+                output_columns.append(column)
+
+        for start, end in ranges:
+            shards.append((path, columns, start, end))
+
+    return shards, output_columns + [PREDICTION_COLUMN]
+
+
+def _score_shard(task):
+    """Pontuar uma parte e gravar a partição de saída"""
+    index, (path, columns, start, end), output_columns, output_dir = task
+    started = time.perf_counter()
+
+    # Ler apenas a faixa de bytes desta parte
+    with open(path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+
+    # Ler tudo como texto, sem inferência de tipos nem NaN, para que colunas que
+    # não são features saiam exatamente como entraram (o esquema aceita notas em texto)
+    if data.strip():
+        df = pd.read_csv(io.BytesIO(data), header=None, names=columns, dtype=str, keep_default_na=False)
+    else:
+        df = pd.DataFrame(columns=columns, dtype=str)
+
+    # Linhas rejeitadas pelo esquema ficam com a predição em branco
+    predictions, errors = _worker_classificador.predict_batch_validated(df)
+    df[PREDICTION_COLUMN] = predictions
+    rejected = int(predictions.isna().sum())
+    samples = [f"{path}: {e['field']}: {e['error']}" for e in errors[:MAX_ERROR_SAMPLES]]
+
+    # Mesma ordem de colunas em todas as partições, para que a junção seja consistente
+    part_file = os.path.join(output_dir, f"part-{index:05d}.csv")
+    df.reindex(columns=output_columns).to_csv(part_file, index=False)
+
+    return index, part_file, len(df), rejected, samples, time.perf_counter() - started, os.getpid()
+
+
+def merge_partitions(part_files, output_file):
+    """Concatenar as partições em ordem, mantendo apenas o primeiro cabeçalho"""
+    with open(output_file, 'wb') as out:
+        expected_header = None
+        for part_file in part_files:
+            with open(part_file, 'rb') as f:
+                header = f.readline()
+                if expected_header is None:
+                    expected_header = header
+                    out.write(header)
+                elif header != expected_header:
+                    raise ValueError(f"Cabeçalho divergente na partição {part_file}")
+                shutil.copyfileobj(f, out)
+
+
+def score_files(input_files, output_file, model_file=None, workers=None,
+                shard_bytes=None, keep_partitions=None):
+    """Pontuar os arquivos em paralelo e gravar o resultado consolidado"""
+    model_file = model_file or Config.MODEL_FILE
+    workers = workers or os.cpu_count() or 1
+
+    if not input_files:
+        raise ValueError("Nenhum arquivo de entrada informado")
+
+    # Validar o modelo no processo principal: uma falha no initializer faria o
+    # pool recriar workers indefinidamente
+    classificador = ClassificadorEstresse()
+    if not classificador.load_model(model_file):
+        raise RuntimeError(f"Não foi possível carregar o modelo de {model_file}")
+    classificador.validate_model()
+
+    shards, output_columns = build_shards(input_files, shard_bytes)
+
+    output_dir = keep_partitions or tempfile.mkdtemp(prefix='pontuar_lote_')
+    os.makedirs(output_dir, exist_ok=True)
+
+    try:
+        tasks = [(i, shard, output_columns, output_dir) for i, shard in enumerate(shards)]
+        started = time.perf_counter()
+
+        with Pool(processes=min(workers, len(shards)), initializer=_init_worker,
+                  initargs=(model_file,)) as pool:
+            results = sorted(pool.imap_unordered(_score_shard, tasks))
+
+        merge_partitions([result[1] for result in results], output_file)
+        elapsed = time.perf_counter() - started
+    finally:
+        if not keep_partitions:
+            shutil.rmtree(output_dir, ignore_errors=True)
+
+    # Estatísticas por worker
+    stats = defaultdict(lambda: {'rows': 0, 'rejected': 0, 'seconds': 0.0, 'shards': 0, 'errors': []})
+    for _, _, rows, rejected, samples, seconds, pid in results:
+        stats[pid]['rows'] += rows
+        stats[pid]['rejected'] += rejected
+        stats[pid]['seconds'] += seconds
+        stats[pid]['shards'] += 1
+        stats[pid]['errors'].extend(samples)
+
+    total_rows = sum(result[2] for result in results)
+    return total_rows, elapsed, dict(stats)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pontuação em lote paralela do nível de estresse")
+    parser.add_argument('inputs', nargs='+', help="Arquivos CSV de entrada")
+    parser.add_argument('-o', '--output', required=True, help="Arquivo CSV consolidado de saída")
+    parser.add_argument('-m', '--model', default=Config.MODEL_FILE, help="Arquivo do modelo treinado")
+    parser.add_argument('-w', '--workers', type=int, default=os.cpu_count(), help="Número de processos")
+    parser.add_argument('--shard-size-mb', type=float, default=None,
+                        help="Dividir cada arquivo em faixas de aproximadamente este tamanho (MB)")
+    parser.add_argument('--keep-partitions', default=None,
+                        help="Diretório onde manter as partições intermediárias")
+    args = parser.parse_args(argv)
+
+    shard_bytes = int(args.shard_size_mb * 1024 * 1024) if args.shard_size_mb else None
+
+    try:
+        total_rows, elapsed, stats = score_files(
+            args.inputs, args.output,
+            model_file=args.model,
+            workers=args.workers,
+            shard_bytes=shard_bytes,
+            keep_partitions=args.keep_partitions
+        )
+    except Exception as e:
+        print(f"Erro na pontuação em lote: {e}", file=sys.stderr)
+        return 1
+
+    for pid, s in sorted(stats.items()):
+        rate = s['rows'] / s['seconds'] if s['seconds'] else 0.0
+        print(f"Worker {pid}: {s['shards']} partes, {s['rows']} linhas "
+              f"({s['rejected']} rejeitadas), {rate:,.0f} linhas/s")
+
+    rejected = sum(s['rejected'] for s in stats.values())
+    if rejected:
+        print(f"{rejected} linha(s) rejeitada(s) na validação ficaram sem predição, por exemplo:")
+        for error in [e for s in stats.values() for e in s['errors']][:MAX_ERROR_SAMPLES]:
+            print(f"  {error}")
+
+    rate = total_rows / elapsed if elapsed else 0.0
+    print(f"Total: {total_rows} linhas em {elapsed:.2f}s ({rate:,.0f} linhas/s) -> {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -7,25 +7,192 @@ import pandas as pd
 import numpy as np
 import pickle
 import os
+import tempfile
+import threading
+from collections import namedtuple
+from types import MappingProxyType
+from datetime import datetime
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import LabelEncoder
 from sklearn.tree import DecisionTreeClassifier
-from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
+from sklearn.metrics import confusion_matrix
 import kagglehub
 
+from src.validacao import EsquemaEntrada, FAIXA_NOTAS_PADRAO
+
+
+def calcular_metricas_confusao(cm, target_names):
+    """Derivar acurácia e relatório por classe de uma matriz de confusão.
+
+    Produz o mesmo formato de ``classification_report(output_dict=True)`` em
+    O(k²), sem precisar das predições originais.
+    """
+    cm = np.asarray(cm, dtype=float)
+    tp = np.diag(cm)
+    support = cm.sum(axis=1)
+    predicted = cm.sum(axis=0)
+    total = cm.sum()
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        precision = np.where(predicted > 0, tp / predicted, 0.0)
+        recall = np.where(support > 0, tp / support, 0.0)
+        f1 = np.where(precision + recall > 0, 2 * precision * recall / (precision + recall), 0.0)
+    
+    accuracy = float(tp.sum() / total) if total else 0.0
+    weights = support / total if total else np.zeros_like(support)
+    
+    report = {}
+    for i, name in enumerate(target_names):
+        report[name] = {
+            'precision': float(precision[i]),
+            'recall': float(recall[i]),
+            'f1-score': float(f1[i]),
+            'support': int(support[i])
+        }
+    report['accuracy'] = accuracy
+    report['macro avg'] = {
+        'precision': float(precision.mean()) if len(target_names) else 0.0,
+        'recall': float(recall.mean()) if len(target_names) else 0.0,
+        'f1-score': float(f1.mean()) if len(target_names) else 0.0,
+        'support': int(total)
+    }
+    report['weighted avg'] = {
+        'precision': float((precision * weights).sum()),
+        'recall': float((recall * weights).sum()),
+        'f1-score': float((f1 * weights).sum()),
+        'support': int(total)
+    }
+    
+    return accuracy, report
+
+
+class ModeloSnapshot(namedtuple('ModeloSnapshot', [
+        'model', 'label_encoders', 'feature_names', 'target_classes', 'feature_ranges',
+        'confusion', 'metrics', 'schema', 'is_model_trained', 'version', 'created_at'])):
+    """Estado de serviço imutável do classificador.
+
+    Cada treino ou carregamento gera um novo snapshot, publicado por uma única
+    troca de referência. Leitores obtêm o snapshot uma vez e o usam até o fim
+    da requisição, sem lock e sem ver estados parciais de um retreino.
+    
+    Coleções ficam congeladas (``MappingProxyType`` e ``tuple``) para que
+    nenhum leitor altere o snapshot publicado.
+    
+    ``confusion`` é o acumulador de avaliação (k x k, somente leitura) e
+    ``metrics`` as métricas já derivadas dele no momento da publicação;
+    ``schema`` é o validador de entrada compilado para este modelo.
+    """
+    __slots__ = ()
+
+    def is_trained(self):
+        """Verificar se o snapshot contém um modelo treinado"""
+        return self.is_model_trained and self.model is not None
+    
+    def class_labels(self):
+        """Rótulos de exibição das classes (as próprias notas de estresse)"""
+        return [str(int(c)) for c in self.target_classes]
+
+
+SNAPSHOT_VAZIO = ModeloSnapshot(
+    model=None,
+    label_encoders=MappingProxyType({}),
+    feature_names=(),
+    target_classes=(),
+    feature_ranges=MappingProxyType({}),
+    confusion=None,
+    metrics=None,
+    schema=None,
+    is_model_trained=False,
+    version=0,
+    created_at=None
+)
+
+
 class ClassificadorEstresse:
     def __init__(self):
-        self.model = None
-        self.label_encoders = {}
-        self.feature_names = []
-        self.target_classes = []
-        self.X_test = None
-        self.y_test = None
-        self.y_pred = None
-        self.is_model_trained = False
-        
-    def train_model(self):
+        # Referência única para o estado de serviço; só é trocada, nunca mutada
+        self._snapshot = SNAPSHOT_VAZIO
+        # Serializa apenas os escritores (treino/carregamento); leitores não usam lock
+        self._write_lock = threading.Lock()
+    
+    # Acesso de compatibilidade aos campos do snapshot atual
+    model = property(lambda self: self._snapshot.model)
+    label_encoders = property(lambda self: self._snapshot.label_encoders)
+    feature_names = property(lambda self: self._snapshot.feature_names)
+    target_classes = property(lambda self: self._snapshot.target_classes)
+    is_model_trained = property(lambda self: self._snapshot.is_model_trained)
+    
+    def get_snapshot(self):
+        """Obter o snapshot de serviço atual (leitura sem lock)"""
+        return self._snapshot
+    
+    def _publish(self, base=None, **fields):
+        """Construir um novo snapshot e publicá-lo com uma troca atômica de referência"""
+        snapshot = self._build_snapshot(base, **fields)
+        self._snapshot = snapshot
+        return snapshot
+    
+    def _build_snapshot(self, base=None, **fields):
+        """Construir um snapshot completo (métricas e esquema) sem publicá-lo"""
+        # Copiar e congelar as coleções recebidas
+        for name in ('label_encoders', 'feature_ranges'):
+            if name in fields:
+                fields[name] = MappingProxyType(dict(fields[name]))
+        for name in ('feature_names', 'target_classes'):
+            if name in fields:
+                fields[name] = tuple(fields[name])
+        
+        snapshot = (base or SNAPSHOT_VAZIO)._replace(
+            version=self._snapshot.version + 1,
+            created_at=datetime.now(),
+            **fields
+        )
+        snapshot = snapshot._replace(
+            metrics=self._build_metrics(snapshot),
+            schema=self._build_schema(snapshot)
+        )
+        return snapshot
+    
+    def _build_metrics(self, snapshot):
+        """Calcular as métricas servidas a partir do acumulador de confusão"""
+        if not snapshot.is_trained() or snapshot.confusion is None:
+            return None
+        
+        accuracy, classification_rep = calcular_metricas_confusao(
+            snapshot.confusion, snapshot.class_labels()
+        )
+        
+        return {
+            'accuracy': accuracy,
+            'classification_report': classification_rep,
+            'confusion_matrix': snapshot.confusion.tolist(),
+            'class_labels': snapshot.class_labels(),
+            'feature_importance': snapshot.model.feature_importances_.tolist(),
+            'feature_names': list(snapshot.feature_names)
+        }
+    
+    def _build_schema(self, snapshot):
+        """Compilar o esquema de validação de entrada do snapshot"""
+        if not snapshot.is_trained():
+            return None
+        
+        return EsquemaEntrada(snapshot.feature_names, snapshot.label_encoders, snapshot.feature_ranges)
+    
+    @staticmethod
+    def _freeze_confusion(cm):
+        """Copiar a matriz de confusão como array inteiro somente leitura"""
+        if cm is None:
+            return None
+        cm = np.array(cm, dtype=np.int64)
+        cm.setflags(write=False)
+        return cm
+    
+    def train_model(self, filename='model.pkl'):
         """Treinar o modelo de classificação"""
+        with self._write_lock:
+            return self._train_model(filename)
+    
+    def _train_model(self, filename):
         try:
             print("Iniciando treinamento do modelo...")
             
@@ -47,12 +214,13 @@ class ClassificadorEstresse:
             
             df = df.dropna()
             
-            # Codificar variáveis categóricas
+            # Codificar variáveis categóricas (encoders novos, sem tocar no snapshot publicado)
+            label_encoders = {}
             categorical_cols = df.select_dtypes(include=['object']).columns
             for col in categorical_cols:
                 le = LabelEncoder()
                 df[col] = le.fit_transform(df[col])
-                self.label_encoders[col] = le
+                label_encoders[col] = le
             
             # Separar features e alvo
             target_column = 'Rate your academic stress index'
@@ -62,27 +230,38 @@ class ClassificadorEstresse:
             X = df.drop(columns=[target_column])
             y = df[target_column]
             
-            self.feature_names = X.columns.tolist()
-            self.target_classes = sorted(y.unique())
-            
             # Dividir dados
             X_train, X_test, y_train, y_test = train_test_split(
                 X, y, test_size=0.2, random_state=42, stratify=y
             )
             
             # Treinar modelo
-            self.model = DecisionTreeClassifier(random_state=42, max_depth=3)
-            self.model.fit(X_train, y_train)
+            model = DecisionTreeClassifier(random_state=42, max_depth=3)
+            model.fit(X_train, y_train)
+            
+            # Acumulador de avaliação a partir do conjunto de teste
+            target_classes = sorted(y.unique())
+            cm = confusion_matrix(y_test, model.predict(X_test), labels=target_classes)
             
-            # Fazer predições para métricas
-            self.y_pred = self.model.predict(X_test)
-            self.X_test = X_test
-            self.y_test = y_test
+            # Faixas das features numéricas (notas), no mínimo a escala 1-5 do questionário
+            feature_ranges = {
+                col: (min(int(X[col].min()), FAIXA_NOTAS_PADRAO[0]), max(int(X[col].max()), FAIXA_NOTAS_PADRAO[1]))
+                for col in X.columns if col not in label_encoders
+            }
             
-            self.is_model_trained = True
+            # Publicar o novo estado de uma só vez
+            self._publish(
+                model=model,
+                label_encoders=label_encoders,
+                feature_names=X.columns.tolist(),
+                target_classes=target_classes,
+                feature_ranges=feature_ranges,
+                confusion=self._freeze_confusion(cm),
+                is_model_trained=True
+            )
             
             # Salvar modelo treinado
-            self.save_model()
+            self.save_model(filename)
             
             print("Modelo treinado com sucesso!")
             return True
@@ -93,16 +272,30 @@ class ClassificadorEstresse:
     
     def save_model(self, filename='model.pkl'):
         """Salvar modelo treinado"""
+        snapshot = self._snapshot
+        # Tipos simples no artefato (MappingProxyType não é serializável)
         model_data = {
-            'model': self.model,
-            'label_encoders': self.label_encoders,
-            'feature_names': self.feature_names,
-            'target_classes': self.target_classes,
-            'is_trained': self.is_model_trained
+            'model': snapshot.model,
+            'label_encoders': dict(snapshot.label_encoders),
+            'feature_names': list(snapshot.feature_names),
+            'target_classes': list(snapshot.target_classes),
+            'feature_ranges': dict(snapshot.feature_ranges),
+            'confusion_matrix': snapshot.confusion,
+            'is_trained': snapshot.is_model_trained
         }
         
-        with open(filename, 'wb') as f:
-            pickle.dump(model_data, f)
+        # Gravar num arquivo temporário e trocar atomicamente, para que leitores
+        # concorrentes nunca vejam um pickle truncado
+        directory = os.path.dirname(os.path.abspath(filename))
+        fd, tmp_file = tempfile.mkstemp(dir=directory, prefix='.model-', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(model_data, f)
+            os.replace(tmp_file, filename)
+        except Exception:
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
+            raise
         print(f"Modelo salvo como {filename}")
     
     def load_model(self, filename='model.pkl'):
@@ -111,11 +304,21 @@ class ClassificadorEstresse:
             with open(filename, 'rb') as f:
                 model_data = pickle.load(f)
             
-            self.model = model_data['model']
-            self.label_encoders = model_data['label_encoders']
-            self.feature_names = model_data['feature_names']
-            self.target_classes = model_data['target_classes']
-            self.is_model_trained = model_data['is_trained']
+            with self._write_lock:
+                snapshot = self._build_snapshot(
+                    model=model_data['model'],
+                    label_encoders=model_data['label_encoders'],
+                    feature_names=model_data['feature_names'],
+                    target_classes=model_data['target_classes'],
+                    feature_ranges=model_data.get('feature_ranges', {}),
+                    # Artefatos antigos não têm avaliação persistida
+                    confusion=self._freeze_confusion(model_data.get('confusion_matrix')),
+                    is_model_trained=model_data['is_trained']
+                )
+                
+                # Validar antes de publicar: um artefato inválido nunca é servido
+                self.validate_model(snapshot)
+                self._snapshot = snapshot
             
             print(f"Modelo carregado de {filename}")
             return True
@@ -129,18 +332,19 @@ class ClassificadorEstresse:
     
     def is_trained(self):
         """Verificar se o modelo está treinado"""
-        return self.is_model_trained and self.model is not None
+        return self._snapshot.is_trained()
     
-    def prepare_input_data(self, form_data):
+    def prepare_input_data(self, form_data, snapshot=None):
         """Preparar dados de entrada para predição"""
-        if not self.is_trained():
+        snapshot = snapshot or self._snapshot
+        if not snapshot.is_trained():
             raise ValueError("Modelo não está treinado")
         
         # Criar dataframe com os dados do formulário
         df = pd.DataFrame([form_data])
         
         # Aplicar label encoders para colunas categóricas
-        for col, le in self.label_encoders.items():
+        for col, le in snapshot.label_encoders.items():
             if col in df.columns:
                 try:
                     df[col] = le.transform(df[col])
@@ -152,45 +356,53 @@ class ClassificadorEstresse:
                     df[col] = 0
         
         # Garantir que todas as features estejam presentes
-        for feature in self.feature_names:
+        for feature in snapshot.feature_names:
             if feature not in df.columns:
                 print(f"Aviso: Feature '{feature}' não encontrada nos dados de entrada, usando valor padrão 0")
                 df[feature] = 0
         
         # Reordenar colunas para corresponder ao modelo
-        df = df[self.feature_names]
+        df = df[list(snapshot.feature_names)]
         
         print(f"Dados preparados para predição: {df.iloc[0].to_dict()}")
         
         return df
     
-    def predict_single(self, input_data):
+    def predict_single(self, input_data, snapshot=None):
         """Fazer predição para uma amostra"""
-        if not self.is_trained():
+        snapshot = snapshot or self._snapshot
+        if not snapshot.is_trained():
             raise ValueError("Modelo não está treinado")
         
-        prediction = self.model.predict(input_data)
-        # Converter de volta para escala 1-5 (modelo usa 0-4)
-        return prediction[0] + 1
+        # O modelo já prevê na escala das notas (target_classes)
+        prediction = snapshot.model.predict(input_data)
+        return prediction[0]
     
-    def predict_probability(self, input_data):
+    def predict_probability(self, input_data, snapshot=None):
         """Obter probabilidades de predição"""
-        if not self.is_trained():
+        snapshot = snapshot or self._snapshot
+        if not snapshot.is_trained():
             raise ValueError("Modelo não está treinado")
         
-        probabilities = self.model.predict_proba(input_data)
+        probabilities = snapshot.model.predict_proba(input_data)
         return probabilities[0]
     
-    def predict_batch(self, df):
+    def predict_batch(self, df, snapshot=None):
         """Fazer predições em lote"""
-        if not self.is_trained():
+        snapshot = snapshot or self._snapshot
+        if not snapshot.is_trained():
             raise ValueError("Modelo não está treinado")
         
+        # O modelo já prevê na escala das notas (target_classes)
+        return snapshot.model.predict(self._encode_batch(df, snapshot))
+    
+    def _encode_batch(self, df, snapshot):
+        """Codificar um lote de forma tolerante (valores desconhecidos viram 0)"""
         # Pré-processar dados
         df = df.copy()
         
         # Aplicar label encoders
-        for col, le in self.label_encoders.items():
+        for col, le in snapshot.label_encoders.items():
             if col in df.columns:
                 try:
                     df[col] = le.transform(df[col])
@@ -198,57 +410,185 @@ class ClassificadorEstresse:
                     df[col] = 0
         
         # Garantir que todas as features estejam presentes
-        for feature in self.feature_names:
+        for feature in snapshot.feature_names:
             if feature not in df.columns:
                 df[feature] = 0
         
-        df = df[self.feature_names]
+        return df[list(snapshot.feature_names)]
+    
+    def validate_input(self, data, snapshot=None):
+        """Validar e codificar uma amostra; retorna (DataFrame ou None, erros por campo)"""
+        snapshot = snapshot or self._snapshot
+        if not snapshot.is_trained():
+            raise ValueError("Modelo não está treinado")
         
-        predictions = self.model.predict(df)
-        # Converter de volta para escala 1-5 (modelo usa 0-4)
-        return predictions + 1
+        row, errors = snapshot.schema.validate_row(data)
+        if errors:
+            return None, errors
+        
+        return snapshot.schema.to_frame([row]), {}
     
-    def get_metrics(self):
-        """Obter métricas de avaliação do modelo"""
-        if not self.is_trained() or self.y_pred is None:
-            return None
+    def predict_batch_validated(self, df, snapshot=None):
+        """Validar o lote e prever apenas as linhas válidas.
+
+        Retorna (predições na escala de target_classes com <NA> nas linhas rejeitadas, erros).
+        """
+        snapshot = snapshot or self._snapshot
+        if not snapshot.is_trained():
+            raise ValueError("Modelo não está treinado")
         
-        accuracy = accuracy_score(self.y_test, self.y_pred)
+        encoded, valid, errors = snapshot.schema.validate_batch(df)
         
-        # Mapear labels de volta para 1-5 para exibição
-        target_names = [str(i) for i in range(1, 6)]
-        classification_rep = classification_report(
-            self.y_test, self.y_pred, 
-            output_dict=True, 
-            zero_division=0,
-            target_names=target_names
-        )
+        predictions = pd.Series(pd.NA, index=df.index, dtype='Int64')
+        if valid.any():
+            # O modelo já prevê na escala das notas (target_classes)
+            predictions[valid] = snapshot.model.predict(encoded[valid].astype(int))
         
-        metrics = {
-            'accuracy': float(accuracy),
-            'classification_report': classification_rep,
-            'confusion_matrix': confusion_matrix(self.y_test, self.y_pred).tolist(),
-            'feature_importance': self.model.feature_importances_.tolist(),
-            'feature_names': self.feature_names
-        }
+        return predictions, errors
+    
+    def registrar_feedback(self, df, labels, filename=None):
+        """Atualizar o acumulador de avaliação com amostras rotuladas (mesma escala de target_classes).
+
+        Retorna (amostras registradas, erros por linha/campo das rejeitadas). Com ``filename`` o artefato inteiro é regravado a partir do snapshot deste
+        processo. A persistência do feedback deve ter um único escritor: vários
+        processos gravando o mesmo arquivo sobrescrevem as atualizações uns dos outros.
+        """
+        with self._write_lock:
+            snapshot = self._snapshot
+            if not snapshot.is_trained():
+                raise ValueError("Modelo não está treinado")
+            
+            if len(df) != len(labels):
+                raise ValueError("Número de rótulos diferente do número de amostras")
+            
+            # Validar as amostras pelo esquema; linhas rejeitadas não entram na matriz
+            encoded, valid, errors = snapshot.schema.validate_batch(df.reset_index(drop=True))
+            
+            # Rótulos e predições do modelo estão na mesma escala de target_classes
+            class_index = {int(c): i for i, c in enumerate(snapshot.target_classes)}
+            labels = pd.Series(list(labels))
+            true_idx = pd.to_numeric(labels, errors='coerce').map(class_index)
+            bad_labels = (true_idx.isna() | labels.map(type).isin([bool, np.bool_])).to_numpy()
+            for i in np.flatnonzero(bad_labels):
+                errors.append({
+                    'row': int(i),
+                    'field': 'label',
+                    'error': f"Rótulo inválido '{labels[i]}'; valores válidos: {snapshot.class_labels()}"
+                })
+            valid &= ~bad_labels
+            
+            if not valid.any():
+                return 0, errors
+            
+            predictions = snapshot.model.predict(encoded[valid].astype(int))
+            pred_idx = pd.Series(predictions).map(class_index)
+            
+            k = len(class_index)
+            cm = np.zeros((k, k), dtype=np.int64) if snapshot.confusion is None else snapshot.confusion.copy()
+            np.add.at(cm, (true_idx[valid].to_numpy(dtype=int), pred_idx.to_numpy(dtype=int)), 1)
+            
+            self._publish(base=snapshot, confusion=self._freeze_confusion(cm))
+            
+            if filename:
+                self.save_model(filename)
+        
+        return int(valid.sum()), errors
+    
+    def get_metrics(self, snapshot=None):
+        """Obter métricas de avaliação do modelo"""
+        snapshot = snapshot or self._snapshot
+        if not snapshot.is_trained():
+            return None
         
-        return metrics
+        # Pré-calculadas na publicação do snapshot
+        return snapshot.metrics
     
-    def get_confusion_matrix(self):
+    def get_confusion_matrix(self, snapshot=None):
         """Obter matriz de confusão"""
-        if not self.is_trained() or self.y_pred is None:
+        snapshot = snapshot or self._snapshot
+        if not snapshot.is_trained():
             return None
         
-        return confusion_matrix(self.y_test, self.y_pred)
+        return snapshot.confusion
+    
+    def validate_model(self, snapshot=None):
+        """Validar a consistência do modelo carregado"""
+        snapshot = snapshot or self._snapshot
+        if not snapshot.is_trained():
+            raise ValueError("Modelo não está treinado")
+        
+        for method in ('predict', 'predict_proba'):
+            if not hasattr(snapshot.model, method):
+                raise ValueError(f"Modelo não implementa '{method}'")
+        
+        if not snapshot.feature_names:
+            raise ValueError("Modelo sem nomes de features")
+        
+        n_features = getattr(snapshot.model, 'n_features_in_', len(snapshot.feature_names))
+        if n_features != len(snapshot.feature_names):
+            raise ValueError(
+                f"Modelo espera {n_features} features, artefato lista {len(snapshot.feature_names)}"
+            )
+        
+        unknown = set(snapshot.label_encoders) - set(snapshot.feature_names)
+        if unknown:
+            raise ValueError(f"Label encoders sem feature correspondente: {sorted(unknown)}")
+        
+        # Predições, rótulos e matriz de confusão precisam estar na mesma escala
+        classes = getattr(snapshot.model, 'classes_', None)
+        if classes is None or not np.array_equal(np.asarray(classes), np.asarray(snapshot.target_classes)):
+            raise ValueError(
+                f"Classes do modelo {list(classes) if classes is not None else None} "
+                f"diferem de target_classes {list(snapshot.target_classes)}"
+            )
+        
+        return True
+    
+    def synthetic_rows(self, n_rows=32, snapshot=None):
+        """Gerar linhas sintéticas válidas (classes conhecidas e notas 1-5)"""
+        snapshot = snapshot or self._snapshot
+        data = {}
+        for feature in snapshot.feature_names:
+            if feature in snapshot.label_encoders:
+                classes = snapshot.label_encoders[feature].classes_
+                data[feature] = [classes[i % len(classes)] for i in range(n_rows)]
+            else:
+                lo, hi = snapshot.schema.numeric[feature]
+                data[feature] = [lo + i % (hi - lo + 1) for i in range(n_rows)]
+        
+        return pd.DataFrame(data, columns=list(snapshot.feature_names))
+    
+    def warm_up(self, n_rows=32):
+        """Exercitar os caminhos de predição para pagar os custos de primeira chamada"""
+        snapshot = self._snapshot
+        self.validate_model(snapshot)
+        
+        started = datetime.now()
+        df = self.synthetic_rows(n_rows, snapshot)
+        
+        # Somente os caminhos usados pelas rotas: lote validado (upload CSV e
+        # lista na API) e amostra individual validada (formulário / API)
+        self.predict_batch_validated(df, snapshot)
+        input_data, errors = self.validate_input(df.iloc[0].to_dict(), snapshot)
+        if errors:
+            raise ValueError(f"Esquema rejeitou linha sintética: {errors}")
+        self.predict_single(input_data, snapshot)
+        self.predict_probability(input_data, snapshot)
+        self.get_feature_importance(snapshot)
+        
+        elapsed = (datetime.now() - started).total_seconds()
+        print(f"Aquecimento concluído com {n_rows} linhas sintéticas em {elapsed:.3f}s")
+        return True
     
-    def get_feature_importance(self):
+    def get_feature_importance(self, snapshot=None):
         """Obter importância das features"""
-        if not self.is_trained():
+        snapshot = snapshot or self._snapshot
+        if not snapshot.is_trained():
             return None
         
-        importances = self.model.feature_importances_
+        importances = snapshot.model.feature_importances_
         importance_df = pd.DataFrame({
-            'Feature': self.feature_names,
+            'Feature': snapshot.feature_names,
             'Importance': importances
         }).sort_values(by='Importance', ascending=False)
         
@@ -256,15 +596,17 @@ class ClassificadorEstresse:
     
     def get_feature_names_for_form(self):
         """Obter nomes das features para criar formulário dinâmico"""
-        if not self.is_trained():
+        snapshot = self._snapshot
+        if not snapshot.is_trained():
             return []
         
-        return self.feature_names
+        return snapshot.feature_names
     
     def get_label_encoder_classes(self, column_name):
         """Obter classes de um label encoder específico"""
-        if column_name in self.label_encoders:
-            return self.label_encoders[column_name].classes_.tolist()
+        label_encoders = self._snapshot.label_encoders
+        if column_name in label_encoders:
+            return label_encoders[column_name].classes_.tolist()
         return []
 
 # Instância global do classificador para uso na aplicação
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""
+Validação de entrada compilada a partir do esquema do modelo
+"""
+
+import numpy as np
+import pandas as pd
+
+# Faixa das perguntas de nota quando o artefato não registra os limites
+FAIXA_NOTAS_PADRAO = (1, 5)
+
+
+def _normalizar_texto(value):
+    """Normalizar valores categóricos (espaços nas pontas e caixa)"""
+    return str(value).strip().casefold()
+
+
+class EsquemaEntrada:
+    """Esquema de entrada compilado uma vez por snapshot do modelo.
+
+    Guarda a tabela valor -> código de cada label encoder e a faixa de cada
+    feature numérica, para validar e já codificar as entradas sem passar pelo
+    pipeline do pandas. Erros são devolvidos por campo.
+    
+    Campos que não são features do modelo são ignorados, tanto numa amostra
+    quanto num lote (ex.: colunas de identificação em CSVs); um nome de feature
+    digitado errado aparece como campo obrigatório ausente.
+    """
+
+    def __init__(self, feature_names, label_encoders, feature_ranges=None):
+        feature_ranges = feature_ranges or {}
+        self.feature_names = list(feature_names)
+        self.categorical = {}
+        self.valid_values = {}
+        self.numeric = {}
+
+        for feature in self.feature_names:
+            if feature in label_encoders:
+                classes = label_encoders[feature].classes_
+                # O código do LabelEncoder é a posição da classe em classes_
+                self.categorical[feature] = {
+                    _normalizar_texto(value): code for code, value in enumerate(classes)
+                }
+                self.valid_values[feature] = [str(value) for value in classes]
+            else:
+                lo, hi = feature_ranges.get(feature, FAIXA_NOTAS_PADRAO)
+                self.numeric[feature] = (int(lo), int(hi))
+
+    def validate_row(self, data):
+        """Validar uma amostra; retorna (linha codificada ou None, erros por campo)"""
+        if not isinstance(data, dict):
+            return None, {'_': 'Esperado um objeto com as features do modelo'}
+
+        errors = {}
+        row = {}
+
+        for feature, lookup in self.categorical.items():
+            value = data.get(feature)
+            if value is None or value == '':
+                errors[feature] = 'Campo obrigatório'
+                continue
+
+            code = lookup.get(_normalizar_texto(value))
+            if code is None:
+                errors[feature] = f"Valor inválido '{value}'; valores válidos: {self.valid_values[feature]}"
+            else:
+                row[feature] = code
+
+        for feature, (lo, hi) in self.numeric.items():
+            value = data.get(feature)
+            if value is None or value == '':
+                errors[feature] = 'Campo obrigatório'
+                continue
+
+            # bool é subclasse de int; true/false não são notas válidas
+            if isinstance(value, (bool, np.bool_)):
+                errors[feature] = f"Valor numérico esperado, recebido '{value}'"
+                continue
+
+            try:
+                number = float(value)
+            except (TypeError, ValueError):
+                errors[feature] = f"Valor numérico esperado, recebido '{value}'"
+                continue
+
+            if not number.is_integer() or not lo <= number <= hi:
+                errors[feature] = f"Esperado inteiro entre {lo} e {hi}, recebido '{value}'"
+            else:
+                row[feature] = int(number)
+
+        if errors:
+            return None, errors
+
+        return row, {}
+
+    def to_frame(self, rows):
+        """Montar o DataFrame na ordem de features esperada pelo modelo"""
+        return pd.DataFrame(rows, columns=self.feature_names)
+
+    def validate_batch(self, df):
+        """Validar um lote de forma vetorizada.
+
+        Retorna (DataFrame codificado, máscara de linhas válidas, lista de erros
+        ``{'row', 'field', 'error'}``). Linhas inválidas ficam com NaN no frame.
+        """
+        valid = np.ones(len(df), dtype=bool)
+        encoded = pd.DataFrame(index=df.index)
+        errors = []
+
+        for feature in self.feature_names:
+            if feature not in df.columns:
+                errors.append({'row': None, 'field': feature, 'error': 'Coluna obrigatória ausente'})
+                valid[:] = False
+                encoded[feature] = np.nan
+                continue
+
+            if feature in self.categorical:
+                values = df[feature].map(_normalizar_texto, na_action='ignore')
+                codes = values.map(self.categorical[feature])
+                bad = codes.isna().to_numpy()
+                message = f"Valor inválido; valores válidos: {self.valid_values[feature]}"
+            else:
+                lo, hi = self.numeric[feature]
+                codes = pd.to_numeric(df[feature], errors='coerce')
+                bad = ~(codes.between(lo, hi) & (codes % 1 == 0)).to_numpy()
+                bad |= self._bool_mask(df[feature])
+                codes = codes.where(~bad)
+                message = f"Esperado inteiro entre {lo} e {hi}"
+
+            encoded[feature] = codes
+            valid &= ~bad
+
+            # Laço apenas sobre as linhas rejeitadas
+            column = df[feature].to_numpy()
+            for i in np.flatnonzero(bad):
+                errors.append({'row': int(i), 'field': feature, 'error': f"{message}, recebido '{column[i]}'"})
+
+        return encoded, valid, errors
+
+    @staticmethod
+    def _bool_mask(column):
+        """Marcar valores booleanos, que o pandas converteria em 0/1"""
+        if pd.api.types.is_bool_dtype(column):
+            return np.ones(len(column), dtype=bool)
+        if column.dtype == object:
+            return column.map(type).isin([bool, np.bool_]).to_numpy()
+        return np.zeros(len(column), dtype=bool)
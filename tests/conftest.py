@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""
+Fixtures compartilhadas dos testes
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.preprocessing import LabelEncoder
+from sklearn.tree import DecisionTreeClassifier
+
+from src.classificador_module import ClassificadorEstresse
+
+FEATURES = ['Peer pressure', 'Study Environment']
+
+
+def criar_classificador():
+    """Classificador cuja predição é igual à nota de 'Peer pressure' (classes 1-5)"""
+    le = LabelEncoder().fit(['Noisy', 'Peaceful', 'disrupted'])
+    X = pd.DataFrame({
+        'Peer pressure': [1, 2, 3, 4, 5] * 3,
+        'Study Environment': le.transform(['Noisy', 'Peaceful', 'disrupted'] * 5)
+    })
+    y = X['Peer pressure']
+    model = DecisionTreeClassifier(random_state=42).fit(X, y)
+
+    classificador = ClassificadorEstresse()
+    classificador._publish(
+        model=model,
+        label_encoders={'Study Environment': le},
+        feature_names=FEATURES,
+        target_classes=[1, 2, 3, 4, 5],
+        confusion=classificador._freeze_confusion(np.zeros((5, 5))),
+        is_model_trained=True
+    )
+    return classificador
+
+
+@pytest.fixture
+def classificador():
+    return criar_classificador()
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+Testes dos endpoints de saúde e prontidão da aplicação Flask
+"""
+
+import pickle
+
+import pytest
+
+import app as app_module
+
+AMOSTRA = {'Peer pressure': 4, 'Study Environment': 'Peaceful'}
+
+
+@pytest.fixture
+def client():
+    app_module.app.config['TESTING'] = True
+    return app_module.app.test_client()
+
+
+def iniciar_com_artefato(monkeypatch, path):
+    monkeypatch.setitem(app_module.app.config, 'MODEL_FILE', str(path))
+    assert app_module.init_model()
+
+
+def test_healthz_sempre_ok(client):
+    response = client.get('/healthz')
+
+    assert response.status_code == 200
+    assert response.get_json() == {'status': 'ok'}
+
+
+def test_readyz_sem_artefato(client, monkeypatch, tmp_path):
+    iniciar_com_artefato(monkeypatch, tmp_path / 'ausente.pkl')
+
+    assert client.get('/readyz').status_code == 503
+    assert client.post('/api/predict', json=AMOSTRA).status_code == 503
+    assert client.get('/healthz').status_code == 200
+
+
+def test_readyz_com_artefato_invalido(client, monkeypatch, tmp_path, classificador):
+    path = tmp_path / 'model.pkl'
+    classificador.save_model(str(path))
+
+    # Classes do modelo fora da escala de target_classes
+    with open(path, 'rb') as f:
+        model_data = pickle.load(f)
+    model_data['target_classes'] = [0, 1, 2, 3, 4]
+    with open(path, 'wb') as f:
+        pickle.dump(model_data, f)
+
+    iniciar_com_artefato(monkeypatch, path)
+
+    assert client.get('/readyz').status_code == 503
+    assert not app_module.classificador.is_trained()
+    assert client.post('/api/predict', json=AMOSTRA).status_code == 503
+
+
+def test_readyz_apos_carregar_e_aquecer(client, monkeypatch, tmp_path, classificador):
+    path = tmp_path / 'model.pkl'
+    classificador.save_model(str(path))
+
+    iniciar_com_artefato(monkeypatch, path)
+
+    response = client.get('/readyz')
+    assert response.status_code == 200
+    assert response.get_json()['status'] == 'ready'
+
+    response = client.post('/api/predict', json=AMOSTRA)
+    assert response.status_code == 200
+    assert response.get_json()['prediction'] == 4
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+Testes do ClassificadorEstresse com um modelo pequeno treinado em memória
+"""
+
+import threading
+
+import pandas as pd
+import pytest
+
+
+def test_class_labels_usam_escala_das_notas(classificador):
+
+    assert classificador.get_snapshot().class_labels() == ['1', '2', '3', '4', '5']
+    assert set(classificador.get_metrics()['classification_report']) >= {'1', '5'}
+
+
+def test_feedback_com_rotulos_1_e_5(classificador):
+    df = pd.DataFrame({
+        'Peer pressure': [1, 5],
+        'Study Environment': ['Peaceful', 'Noisy']
+    })
+
+    count, errors = classificador.registrar_feedback(df, [1, 5])
+    assert count == 2
+    assert errors == []
+
+    cm = classificador.get_confusion_matrix()
+    assert cm[0, 0] == 1
+    assert cm[4, 4] == 1
+    assert cm.sum() == 2
+    assert classificador.get_metrics()['accuracy'] == 1.0
+
+
+def test_feedback_rejeita_linhas_invalidas(classificador):
+    df = pd.DataFrame({
+        'Peer pressure': [3, 3, 3],
+        'Study Environment': ['Noisy', 'garbage', 'Noisy']
+    })
+
+    count, errors = classificador.registrar_feedback(df, [3, 3, 9])
+
+    assert count == 1
+    assert {(e['row'], e['field']) for e in errors} == {(1, 'Study Environment'), (2, 'label')}
+    assert classificador.get_confusion_matrix().sum() == 1
+
+
+def test_validacao_consistente_entre_amostra_e_lote(classificador):
+    schema = classificador.get_snapshot().schema
+    amostra = {'Peer pressure': True, 'Study Environment': 'Noisy', 'Extra': 'x'}
+
+    row, errors = schema.validate_row(amostra)
+    _, valid, batch_errors = schema.validate_batch(pd.DataFrame([amostra]))
+
+    assert row is None and set(errors) == {'Peer pressure'}
+    assert not valid[0] and [e['field'] for e in batch_errors] == ['Peer pressure']
+
+
+def test_snapshot_publicado_nao_pode_ser_alterado(classificador):
+    snapshot = classificador.get_snapshot()
+
+    with pytest.raises(TypeError):
+        classificador.label_encoders['Study Environment'] = None
+    with pytest.raises(TypeError):
+        snapshot.feature_ranges['Peer pressure'] = (0, 10)
+    with pytest.raises(AttributeError):
+        classificador.feature_names.append('Extra')
+    with pytest.raises(AttributeError):
+        snapshot.target_classes.append(6)
+
+
+def test_leitor_mantem_snapshot_consistente_durante_publicacao(classificador):
+    snapshot = classificador.get_snapshot()
+    publicado = threading.Event()
+
+    def retreinar():
+        classificador._publish(
+            base=snapshot,
+            feature_names=['Study Environment', 'Peer pressure'],
+            target_classes=[1, 2, 3],
+            confusion=None
+        )
+        publicado.set()
+
+    thread = threading.Thread(target=retreinar)
+    thread.start()
+    assert publicado.wait(5)
+    thread.join()
+
+    # O leitor continua vendo o snapshot que obteve; novos leitores veem o novo
+    assert snapshot.feature_names == ('Peer pressure', 'Study Environment')
+    assert snapshot.target_classes == (1, 2, 3, 4, 5)
+    assert classificador.get_snapshot().version == snapshot.version + 1
+    assert classificador.get_snapshot().target_classes == (1, 2, 3)
+
+
+def test_predicoes_individuais_e_em_lote_na_escala_das_notas(classificador):
+    snapshot = classificador.get_snapshot()
+    df = pd.DataFrame({
+        'Peer pressure': [1, 3, 5],
+        'Study Environment': ['Noisy', 'Peaceful', 'disrupted']
+    })
+
+    assert list(classificador.predict_batch(df, snapshot)) == [1, 3, 5]
+
+    input_data, errors = classificador.validate_input(df.iloc[2].to_dict(), snapshot)
+    assert errors == {}
+    assert classificador.predict_single(input_data, snapshot) == 5
+
+
+def test_predicoes_validadas_pertencem_a_target_classes(classificador):
+    snapshot = classificador.get_snapshot()
+    df = pd.DataFrame({
+        'Peer pressure': [1, 2, 3, 4, 5, 7],
+        'Study Environment': ['Noisy', 'Peaceful', 'disrupted', 'Noisy', 'Peaceful', 'Noisy']
+    })
+
+    predictions, errors = classificador.predict_batch_validated(df, snapshot)
+
+    assert predictions.isna().tolist() == [False] * 5 + [True]
+    assert set(predictions.dropna()) <= set(snapshot.target_classes)
+    assert predictions.dropna().tolist() == [1, 2, 3, 4, 5]
+    assert [e['row'] for e in errors] == [5]
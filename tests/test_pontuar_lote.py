@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+Testes da divisão em faixas de bytes e da junção do script de pontuação em lote
+"""
+
+import pandas as pd
+import pytest
+
+from scripts import pontuar_lote
+
+HEADER = 'id,Peer pressure,Study Environment,note\n'
+AMBIENTES = ['Noisy', 'Peaceful', 'disrupted']
+
+
+def escrever_csv(path, n_rows=40):
+    """CSV com campos entre aspas de várias linhas, aspas escapadas, id em branco e nota inválida"""
+    lines = [HEADER]
+    for i in range(n_rows):
+        rating = 7 if i == 11 else i % 5 + 1
+        row_id = '' if i == 5 else str(i)
+        if i % 3 == 0:
+            note = f'"linha {i}\nele disse ""oi, {i}""\nfim"'
+        elif i % 3 == 1:
+            note = f'"com ""aspas"", e vírgula {i}"'
+        else:
+            note = f'simples {i}'
+        lines.append(f'{row_id},{rating},{AMBIENTES[i % 3]},{note}\n')
+    path.write_text(''.join(lines), encoding='utf-8')
+    return path
+
+
+def pontuar_em_processo(classificador, paths, shard_bytes, tmp_path, monkeypatch):
+    """Executar o pipeline do script sem o pool: partes, workers e junção"""
+    monkeypatch.setattr(pontuar_lote, '_worker_classificador', classificador)
+    shards, output_columns = pontuar_lote.build_shards([str(p) for p in paths], shard_bytes)
+
+    part_dir = tmp_path / 'parts'
+    part_dir.mkdir(exist_ok=True)
+    results = [
+        pontuar_lote._score_shard((i, shard, output_columns, str(part_dir)))
+        for i, shard in enumerate(shards)
+    ]
+
+    output = tmp_path / 'resultado.csv'
+    pontuar_lote.merge_partitions([result[1] for result in results], str(output))
+    return shards, pd.read_csv(output, dtype=str, keep_default_na=False)
+
+
+def ler_texto(path):
+    return pd.read_csv(path, dtype=str, keep_default_na=False)
+
+
+@pytest.mark.parametrize('shard_bytes', [1, 13, 64, 200])
+def test_faixas_cobrem_o_corpo_sem_cortar_campos_entre_aspas(tmp_path, monkeypatch, shard_bytes):
+    monkeypatch.setattr(pontuar_lote, 'SCAN_BLOCK_SIZE', 7)
+    path = escrever_csv(tmp_path / 'coorte.csv')
+    data = path.read_bytes()
+
+    header, ranges = pontuar_lote._shard_ranges(str(path), shard_bytes)
+    parts = [data[start:end] for start, end in ranges]
+
+    assert header == HEADER.encode()
+    assert len(ranges) > 1
+    assert b''.join(parts) == data[len(header):]
+    for part in parts:
+        assert part.endswith(b'\n')
+        assert part.count(b'"') % 2 == 0
+
+
+@pytest.mark.parametrize('shard_bytes', [None, 1, 13, 64])
+def test_saida_igual_a_pontuacao_em_processo_unico(tmp_path, monkeypatch, classificador, shard_bytes):
+    monkeypatch.setattr(pontuar_lote, 'SCAN_BLOCK_SIZE', 7)
+    path = escrever_csv(tmp_path / 'coorte.csv')
+
+    _, merged = pontuar_em_processo(classificador, [path], shard_bytes, tmp_path, monkeypatch)
+
+    expected = ler_texto(path)
+    predictions, _ = classificador.predict_batch_validated(expected)
+
+    # Todas as linhas, na ordem, com colunas de passagem inalteradas
+    pd.testing.assert_frame_equal(merged[expected.columns.tolist()], expected)
+    assert merged[pontuar_lote.PREDICTION_COLUMN].tolist() == [
+        '' if pd.isna(p) else str(int(p)) for p in predictions
+    ]
+    assert merged.loc[5, 'id'] == ''
+    assert merged.loc[11, pontuar_lote.PREDICTION_COLUMN] == ''
+
+
+def test_juncao_alinha_arquivos_com_colunas_em_ordem_diferente(tmp_path, monkeypatch, classificador):
+    monkeypatch.setattr(pontuar_lote, 'SCAN_BLOCK_SIZE', 7)
+    first = escrever_csv(tmp_path / 'a.csv', n_rows=10)
+    second = tmp_path / 'b.csv'
+    reversed_df = ler_texto(first).iloc[:, ::-1]
+    reversed_df.to_csv(second, index=False)
+
+    _, merged = pontuar_em_processo(classificador, [first, second], 13, tmp_path, monkeypatch)
+
+    expected = pd.concat([ler_texto(first), ler_texto(first)], ignore_index=True)
+    assert merged.columns.tolist() == expected.columns.tolist() + [pontuar_lote.PREDICTION_COLUMN]
+    pd.testing.assert_frame_equal(merged[expected.columns.tolist()], expected)
+
+
+def test_juncao_recusa_cabecalhos_divergentes(tmp_path):
+    first = tmp_path / 'part-00000.csv'
+    second = tmp_path / 'part-00001.csv'
+    first.write_text('a,b\n1,2\n')
+    second.write_text('b,a\n3,4\n')
+
+    with pytest.raises(ValueError):
+        pontuar_lote.merge_partitions([str(first), str(second)], str(tmp_path / 'saida.csv'))